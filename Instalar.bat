@@ -20,7 +20,7 @@ if %errorlevel% neq 0 (
 python -m pip install --upgrade pip
 
 :: Instalar pacotes necessários
-pip install moviepy whisper pydub tk matplotlib pillow imageio-ffmpeg
+pip install moviepy faster-whisper numpy tk matplotlib pillow imageio-ffmpeg
 
 :: Baixar e configurar o FFmpeg
 echo Baixando FFmpeg...
@@ -28,6 +28,7 @@ curl -L "https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-m
 if exist ffmpeg.zip (
     powershell -Command "Expand-Archive -Path ffmpeg.zip -DestinationPath ."
     move "ffmpeg-master-latest-win64-gpl\bin\ffmpeg.exe" . >nul
+    move "ffmpeg-master-latest-win64-gpl\bin\ffprobe.exe" . >nul
     rd /s /q "ffmpeg-master-latest-win64-gpl"
     del ffmpeg.zip
 ) else (
@@ -1,60 +1,183 @@
 import os
+import sys
 import subprocess
-import whisper
-from moviepy import VideoFileClip, CompositeVideoClip, TextClip, VideoClip
-from collections import Counter
+from faster_whisper import WhisperModel, BatchedInferencePipeline
+import ctranslate2
+from heapq import nlargest
+from functools import lru_cache
 import re
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from pydub import AudioSegment
-from pydub.silence import detect_nonsilent
+import numpy as np
 import threading
 import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import tempfile
 import shutil
 import atexit
 import json
+import hashlib
+import io
 from pathlib import Path
 import matplotlib.font_manager as fm
-from PIL import ImageFont, ImageDraw
+from PIL import Image, ImageFont, ImageDraw
+try:
+    import orjson  # Opcional: JSON mais rápido para as configurações
+except ImportError:
+    orjson = None
 
 # Configurações constantes
 CONFIG_DIR = os.path.join(Path.home(), ".video_processor")
 CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
+FONT_CACHE_FILE = os.path.join(CONFIG_DIR, "fontlist.json")
+
+# Extração de palavras-chave dos títulos
+_WORD_RE = re.compile(r'\w+')
+# Tokens das legendas animadas: palavras, espaços e pontuação
+_TOKEN_RE = re.compile(r'\w+|\s+|[^\w\s]')
+_SKIP_TEXTS = frozenset(("...", "[música]", "[risos]"))
+_STOP_WORDS = frozenset({'e', 'de', 'a', 'o', 'que', 'do', 'da', 'em', 'um', 'para', 'é', 'com', 'não', 'uma', 'os', 'no', 'se', 'na', 'por', 'mais', 'as', 'dos', 'como', 'mas', 'foi', 'ao', 'ele', 'das', 'tem', 'à', 'seu', 'sua', 'ou', 'ser', 'quando', 'muito', 'há', 'nos', 'já', 'está', 'eu', 'também', 'só', 'pelo', 'pela', 'até', 'isso', 'ela', 'entre', 'era', 'depois', 'sem', 'mesmo', 'aos', 'ter', 'seus', 'quem', 'nas', 'me', 'esse', 'eles', 'estão', 'você', 'tinha', 'foram', 'essa', 'num', 'nem', 'suas', 'meu', 'minha', 'têm', 'numa', 'pelos', 'elas', 'havia', 'seja', 'qual', 'será', 'nós', 'tenho', 'lhe', 'deles', 'essas', 'esses', 'pelas', 'este', 'fosse', 'dele', 'tu', 'te', 'vocês', 'vos', 'lhes', 'meus', 'minhas', 'teu', 'tua', 'teus', 'tuas', 'nosso', 'nossa', 'nossos', 'nossas', 'dela', 'delas', 'esta', 'estes', 'estas', 'aquele', 'aquela', 'aqueles', 'aquelas', 'isto', 'aquilo'})
+
+# Saída do filtro silencedetect do ffmpeg
+_SILENCE_RE = re.compile(r'silence_(start|end): (-?\d+(?:\.\d+)?)')
+_DURATION_RE = re.compile(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)')
+# Mensagem do muxer quando o codec copiado não cabe no contêiner de saída
+_MUXER_CODEC_RE = re.compile(r'codec not currently supported in container|Could not find tag for codec')
+
+# Encoders H.264 por hardware, em ordem de preferência, e o fallback por software
+_HW_H264_ENCODERS = [
+    {'name': 'h264_nvenc', 'input': ['-hwaccel', 'cuda'],
+     'output': ['-c:v', 'h264_nvenc', '-preset', 'p4', '-tune', 'hq', '-rc', 'vbr', '-cq', '23', '-b:v', '0'], 'filter': None},
+    {'name': 'h264_qsv', 'input': [],
+     'output': ['-c:v', 'h264_qsv', '-preset', 'fast', '-global_quality', '23'], 'filter': None},
+    {'name': 'h264_amf', 'input': [],
+     'output': ['-c:v', 'h264_amf', '-quality', 'speed', '-rc', 'cqp', '-qp_i', '23', '-qp_p', '23'], 'filter': None},
+    {'name': 'h264_videotoolbox', 'input': [],
+     'output': ['-c:v', 'h264_videotoolbox', '-b:v', '8M'], 'filter': None},
+    {'name': 'h264_vaapi', 'input': ['-vaapi_device', '/dev/dri/renderD128'],
+     'output': ['-c:v', 'h264_vaapi', '-qp', '23'], 'filter': 'format=nv12,hwupload'},
+]
+_LIBX264_ENCODER = {'name': 'libx264', 'input': [],
+                    'output': ['-c:v', 'libx264', '-preset', 'veryfast'], 'filter': None}
+# Encoders por software que trocam velocidade por arquivos menores (só quando escolhidos)
+_SOFTWARE_ENCODERS = [
+    {'name': 'libx265', 'input': [],
+     'output': ['-c:v', 'libx265', '-preset', 'faster', '-crf', '26', '-tag:v', 'hvc1'], 'filter': None},
+    {'name': 'libsvtav1', 'input': [],
+     'output': ['-c:v', 'libsvtav1', '-preset', '8', '-crf', '35'], 'filter': None},
+]
+# Drivers de GPU de consumo limitam as sessões de encode simultâneas (NVENC, por exemplo)
+_HW_MAX_CONCURRENT_ENCODES = 2
+_VIDEO_CODEC_OPTIONS = ['auto', 'libx264', 'libx265', 'libsvtav1'] + [encoder['name'] for encoder in _HW_H264_ENCODERS]
+
+# Divisão dos núcleos entre o Whisper (CTranslate2) e os encodes do ffmpeg
+_WHISPER_CPU_THREADS = max(1, (os.cpu_count() or 2) // 2)
+_FFMPEG_THREADS = max(1, (os.cpu_count() or 2) - _WHISPER_CPU_THREADS)
+
+# Chamadas ao ffmpeg: stdout descartado e stderr capturado (exibido apenas em caso de erro)
+_FFMPEG_QUIET = ["-hide_banner", "-loglevel", "error", "-nostats"]
+_FFMPEG_RUN_OPTIONS = {'stdout': subprocess.DEVNULL, 'stderr': subprocess.PIPE, 'text': True, 'errors': 'replace'}
+
+def _json_dumps(obj, pretty=False):
+    """Serializa as configurações em bytes JSON (orjson quando instalado)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=4).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def _json_loads(data):
+    """Lê configurações em JSON (orjson quando instalado)"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+@lru_cache(maxsize=128)
+def _load_pil_font(path, size):
+    """Carrega uma fonte TrueType pelo PIL, uma vez por (caminho, tamanho)"""
+    return ImageFont.truetype(path, size)
 
 class TempFileManager:
     """Gerenciador de arquivos temporários com limpeza automática"""
-    def __init__(self):
-        self.temp_dir = tempfile.mkdtemp(prefix="video_processor_")
-        self.temp_files = []
+    def __init__(self, base_dir=None):
+        # Com base_dir no mesmo disco da saída, mover um temporário para o destino é só um rename
+        self.temp_dir = tempfile.mkdtemp(prefix="video_processor_", dir=base_dir)
         atexit.register(self.cleanup)
     
     def create_temp_file(self, suffix="", prefix="tmp"):
         """Cria um arquivo temporário gerenciado"""
         fd, path = tempfile.mkstemp(suffix=suffix, prefix=prefix, dir=self.temp_dir)
         os.close(fd)
-        self.temp_files.append(path)
         return path
     
     def cleanup(self):
-        """Remove todos os arquivos temporários e o diretório"""
-        for file_path in self.temp_files:
-            try:
-                if os.path.exists(file_path):
-                    os.unlink(file_path)
-            except Exception as e:
-                print(f"Erro ao remover arquivo temporário {file_path}: {e}")
-        
-        try:
-            if os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir)
-        except Exception as e:
-            print(f"Erro ao remover diretório temporário {self.temp_dir}: {e}")
+        """Remove o diretório temporário e todos os arquivos dentro dele"""
+        # Todos os temporários são criados em temp_dir: uma única varredura remove tudo
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
 
 class FontManager:
     def __init__(self):
-        self.system_fonts = self._load_windows_fonts()
-        self._test_fallback_fonts()
+        # A varredura de fontes é adiada para o primeiro uso, fora da thread da interface
+        self._load_lock = threading.Lock()
+        self.system_fonts = None
+        self.default_font = None
+        self._font_paths = {}  # Cache nome -> caminho (findfont é caro)
+        self._font_files = None  # Índice nome da família -> arquivo, montado a partir do ttflist
+        self._font_available = {}  # Resultado de is_font_available por nome
+    
+    def _font_index(self):
+        """Índice {família em minúsculas: arquivo} das fontes conhecidas pelo matplotlib"""
+        if self._font_files is None:
+            index = {}
+            for entry in fm.fontManager.ttflist:
+                key = entry.name.lower()
+                # Prefere o arquivo regular da família quando há variações (negrito, itálico)
+                if key not in index or (entry.style == 'normal' and entry.weight in (400, 'normal', 'regular')):
+                    index[key] = entry.fname
+            self._font_files = index
+        return self._font_files
+    
+    def _ensure_loaded(self):
+        """Carrega a lista de fontes e a fonte padrão uma única vez (thread-safe)"""
+        with self._load_lock:
+            if self.system_fonts is None and not self._read_font_cache():
+                self.system_fonts = [font for font in self._load_windows_fonts() if self.is_font_available(font)]
+                self._test_fallback_fonts()
+                self._write_font_cache()
+    
+    def _font_cache_key(self):
+        """Identifica o conjunto de fontes do sistema (muda quando fontes são instaladas/removidas)"""
+        # Hash dos pares (nome, arquivo): trocar uma fonte por outra também invalida o cache
+        fonts = sorted((font.name, font.fname) for font in fm.fontManager.ttflist)
+        digest = hashlib.sha1(json.dumps(fonts).encode('utf-8')).hexdigest()
+        return f"{sys.platform}:{digest}"
+    
+    def _read_font_cache(self):
+        """Restaura lista de fontes, fonte padrão e caminhos salvos numa execução anterior"""
+        try:
+            with open(FONT_CACHE_FILE, 'r') as f:
+                cached = json.load(f)
+            if cached.get('key') != self._font_cache_key():
+                return False
+            self._font_paths.update(cached['paths'])
+            self._font_available.update(cached['available'])
+            self.default_font = cached['default_font']
+            self.system_fonts = cached['fonts']
+            return True
+        except (OSError, ValueError, KeyError):
+            return False
+    
+    def _write_font_cache(self):
+        """Salva o resultado da varredura de fontes em CONFIG_DIR"""
+        try:
+            with open(FONT_CACHE_FILE, 'w') as f:
+                json.dump({
+                    'key': self._font_cache_key(),
+                    'fonts': self.system_fonts,
+                    'default_font': self.default_font,
+                    'paths': self._font_paths,
+                    'available': self._font_available
+                }, f)
+        except OSError as e:
+            print(f"Erro ao salvar cache de fontes: {e}")
     
     def _test_fallback_fonts(self):
         """Testa fontes de fallback para garantir que pelo menos uma funciona"""
@@ -71,6 +194,7 @@ class FontManager:
         
     def get_default_font(self):
         """Retorna uma fonte padrão que sabemos que funciona"""
+        self._ensure_loaded()
         return self.default_font or 'Liberation-Sans'
     
     def _load_windows_fonts(self):
@@ -89,12 +213,11 @@ class FontManager:
             available_fonts = []
             for font in common_windows_fonts:
                 try:
-                    font_path = fm.findfont(font, fallback_to_default=False)
-                    if os.path.exists(font_path):
+                    font_path = self._font_index().get(font.lower()) or fm.findfont(font, fallback_to_default=False)
+                    if os.access(font_path, os.R_OK):
                         available_fonts.append(font)
                 except:
                     continue
-            
             return sorted(available_fonts)
             
         except:
@@ -103,19 +226,31 @@ class FontManager:
     
     def get_available_fonts(self):
         """Retorna apenas as fontes do Windows disponíveis"""
+        self._ensure_loaded()
         return self.system_fonts
     
     def get_font_path(self, font_name):
-        """Retorna o caminho da fonte no sistema com fallback robusto"""
+        """Retorna o caminho da fonte no sistema, com cache por nome"""
+        if font_name not in self._font_paths:
+            self._font_paths[font_name] = self._find_font_path(font_name)
+        return self._font_paths[font_name]
+    
+    def _find_font_path(self, font_name):
+        """Procura o caminho da fonte no sistema com fallback robusto"""
         try:
+            # Consulta direta no índice, sem varrer a lista de fontes
+            font_path = self._font_index().get(font_name.lower())
+            if font_path and os.access(font_path, os.R_OK):
+                return font_path
+            
             # Tentativa principal
             font_path = fm.findfont(font_name, fallback_to_default=False)
-            if os.path.exists(font_path):
+            if os.access(font_path, os.R_OK):
                 return font_path
             
             # Fallback 1: Tentar encontrar a fonte sem exceções
             font_path = fm.findfont(font_name.replace(' ', '-'), fallback_to_default=False)
-            if os.path.exists(font_path):
+            if os.access(font_path, os.R_OK):
                 return font_path
                 
             # Fallback 2: Tentar variações comuns
@@ -130,7 +265,7 @@ class FontManager:
                 for variation in variations[font_name]:
                     try:
                         path = fm.findfont(variation, fallback_to_default=False)
-                        if os.path.exists(path):
+                        if os.access(path, os.R_OK):
                             return path
                     except:
                         continue
@@ -143,19 +278,68 @@ class FontManager:
             return fm.findfont('Arial')
     
     def is_font_available(self, font_name):
-        """Verifica se uma fonte pode ser carregada"""
-        try:
-            font_path = self.get_font_path(font_name)
-            # Testa se a fonte pode ser carregada pelo PIL
-            test_font = ImageFont.truetype(font_path, 10)
-            return test_font is not None
-        except:
-            return False
+        """Verifica se uma fonte pode ser carregada (resultado guardado por nome)"""
+        if font_name not in self._font_available:
+            try:
+                font_path = self.get_font_path(font_name)
+                # Testa se a fonte pode ser carregada pelo PIL
+                test_font = _load_pil_font(font_path, 10)
+                self._font_available[font_name] = test_font is not None
+            except:
+                self._font_available[font_name] = False
+        return self._font_available[font_name]
 class VideoProcessor:
     def __init__(self, config, temp_manager, font_manager):
         self.config = config
         self.temp_manager = temp_manager
         self.font_manager = font_manager  # Adicionar referência ao FontManager
+        self.video_encoder = self._detect_video_encoder()
+        self._probes = {}
+        # None: o ffmpeg usa todos os núcleos; só é limitado quando o Whisper transcreve junto com os encodes
+        self.ffmpeg_threads = None
+        
+    def _detect_video_encoder(self):
+        """Escolhe o encoder configurado ou o H.264 mais rápido disponível (libx264 como fallback)"""
+        # 'video_codec' nas configurações força um encoder específico; 'auto' testa os de hardware
+        requested = self.config.get('video_codec', 'auto')
+        candidates = [encoder for encoder in _HW_H264_ENCODERS + _SOFTWARE_ENCODERS
+                      if encoder['name'] == requested or (requested == 'auto' and encoder in _HW_H264_ENCODERS)]
+        if not candidates:
+            return _LIBX264_ENCODER
+        try:
+            result = subprocess.run(["ffmpeg", "-hide_banner", "-encoders"],
+                                    capture_output=True, text=True, timeout=30)
+            listed_encoders = result.stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"Erro ao listar encoders do ffmpeg: {e}")
+            return _LIBX264_ENCODER
+        
+        for encoder in candidates:
+            if encoder['name'] in listed_encoders and self._test_video_encoder(encoder):
+                return encoder
+        return _LIBX264_ENCODER
+
+    def _test_video_encoder(self, encoder):
+        """Codifica um quadro de teste para confirmar que o hardware do encoder está presente"""
+        command = ["ffmpeg", "-hide_banner", "-loglevel", "error"] + encoder['input']
+        command += ["-f", "lavfi", "-i", "color=size=256x256:duration=0.1"]
+        if encoder['filter']:
+            command += ["-vf", encoder['filter']]
+        command += encoder['output'] + ["-frames:v", "1", "-f", "null", "-"]
+        try:
+            return subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30).returncode == 0
+        except (OSError, subprocess.SubprocessError):
+            return False
+
+    def _video_encode_args(self, video_filter=None):
+        """Monta as opções de filtro e de codificação de vídeo para o encoder detectado"""
+        filters = [f for f in (video_filter, self.video_encoder['filter']) if f]
+        args = ["-vf", ",".join(filters)] if filters else []
+        return args + self.video_encoder['output'] + self._threads_args()
+
+    def _threads_args(self):
+        """Opção -threads do ffmpeg, apenas quando há um limite definido"""
+        return ["-threads", str(self.ffmpeg_threads)] if self.ffmpeg_threads else []
         
     def check_fonts(self):
         """Verifica fontes disponíveis e exibe no log"""
@@ -170,12 +354,13 @@ class VideoProcessor:
     
     def _create_text_clip(self, text, font_name, font_size, video_width, color='white', stroke_color='black', stroke_width=1):
         """Cria um TextClip com tratamento robusto de erros de fonte"""
+        from moviepy import TextClip  # MoviePy só é importado quando as legendas animadas são usadas
         try:
             font_size = int(font_size)
             stroke_width = int(stroke_width) if stroke_width else 0
             font_path = self.font_manager.get_font_path(font_name)
             
-            if not font_path or not os.path.exists(font_path):
+            if not font_path:
                 raise ValueError(f"Fonte {font_name} não encontrada")
             
             # Configurações do stroke (contorno)
@@ -218,30 +403,31 @@ class VideoProcessor:
                     size=(int(video_width * 0.9), None),
                     color=color
                 )
-    def find_interesting_segments(self, video_path):
+    def find_interesting_segments(self, video_path, audio_chunks=None):
         """Encontra segmentos interessantes baseado em análise de áudio"""
         try:
-            temp_audio = self.temp_manager.create_temp_file(suffix=".wav", prefix="audio_")
-            self._extract_audio_to_wav(video_path, temp_audio)
-            
-            audio = AudioSegment.from_wav(temp_audio)
+            duration, silences = self._detect_silences(video_path, audio_chunks)
             
-            nonsilent_ranges = detect_nonsilent(
-                audio,
-                min_silence_len=self.config.get('min_silence_len', 1000),
-                silence_thresh=self.config.get('silence_threshold', -40)
-            )
+            # Inverte os silêncios para obter as faixas com som
+            nonsilent_ranges = []
+            prev_end = 0.0
+            for start, end in silences:
+                if start > prev_end:
+                    nonsilent_ranges.append((prev_end, start))
+                prev_end = end
+            if prev_end < duration:
+                nonsilent_ranges.append((prev_end, duration))
             
             moments = []
             for start, end in nonsilent_ranges:
-                margin = self.config.get('safety_margin', 500)
+                margin = self.config.get('safety_margin', 0.5)
                 start = max(0, (start - margin))
-                end = min(len(audio), (end + margin))
+                end = min(duration, (end + margin))
                 
-                if end - start < 2000:  # Pelo menos 2 segundos
+                if end - start < 2:  # Pelo menos 2 segundos
                     continue
                     
-                moments.append(start / 1000)  # Converter para segundos
+                moments.append(start)
             
             if not moments:
                 return self._fallback_segments(video_path)
@@ -251,91 +437,188 @@ class VideoProcessor:
             print(f"Erro ao analisar áudio: {e}")
             return self._fallback_segments(video_path)
 
+    def _detect_silences(self, video_path, audio_chunks=None):
+        """Detecta silêncios com o filtro silencedetect do ffmpeg, retorna (duração, [(início, fim)]) em segundos"""
+        # Se audio_chunks for uma lista, recebe também o PCM 16 kHz mono para o Whisper
+        # Os valores da interface estão em segundos
+        command = [
+            "ffmpeg",
+            "-y",
+            "-hide_banner",
+            "-nostats",
+            "-vn",  # Só o áudio interessa: o vídeo nem é decodificado
+            "-i", video_path
+        ]
+        # A detecção só precisa da energia grosseira: analisa o áudio já em 16 kHz mono
+        downmix = "aresample=16000,aformat=sample_fmts=s16:channel_layouts=mono"
+        silence_filter = f"silencedetect=noise={self.config.get('silence_threshold', -40)}dB:d={self.config.get('min_silence_len', 1.0)}"
+        if audio_chunks is None:
+            command += ["-af", f"{downmix},{silence_filter}", "-f", "null", "-"]
+        else:
+            # O mesmo áudio reamostrado alimenta a detecção e, pelo stdout, o PCM do Whisper
+            command += [
+                "-filter_complex", f"[0:a:0]{downmix},asplit=2[detect][whisper];[detect]{silence_filter}[detected]",
+                "-map", "[detected]",
+                "-f", "null",
+                "-",
+                "-map", "[whisper]",
+                "-f", "s16le",
+                "-acodec", "pcm_s16le",
+                "pipe:1"
+            ]
+        process = subprocess.Popen(command, stderr=subprocess.PIPE,
+                                   stdout=subprocess.DEVNULL if audio_chunks is None else subprocess.PIPE)
+        reader = None
+        if audio_chunks is not None:
+            # O stdout é esvaziado em paralelo para o ffmpeg não travar com o pipe cheio
+            reader = threading.Thread(target=lambda: audio_chunks.append(process.stdout.read()), daemon=True)
+            reader.start()
+        # O stderr só termina quando o ffmpeg sai: o limite de tempo é imposto por um
+        # temporizador que mata o processo, destravando a leitura abaixo
+        timed_out = threading.Event()
+        def kill_on_timeout():
+            timed_out.set()
+            process.kill()
+        watchdog = threading.Timer(300, kill_on_timeout)
+        watchdog.daemon = True
+        watchdog.start()
+        duration = 0.0
+        silences = []
+        silence_start = None
+        try:
+            # As marcações chegam pelo stderr enquanto o ffmpeg lê o arquivo
+            for line in io.TextIOWrapper(process.stderr, encoding='utf-8', errors='replace'):
+                if not duration:
+                    match = _DURATION_RE.search(line)
+                    if match:
+                        hours, minutes, seconds = match.groups()
+                        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+                for kind, value in _SILENCE_RE.findall(line):
+                    if kind == 'start':
+                        silence_start = max(0.0, float(value))
+                    elif silence_start is not None:
+                        silences.append((silence_start, float(value)))
+                        silence_start = None
+            process.wait()
+            if reader:
+                reader.join()
+        finally:
+            watchdog.cancel()
+        
+        if timed_out.is_set():
+            if audio_chunks is not None:
+                audio_chunks.clear()
+            print("Tempo limite excedido para detecção de silêncio")
+            raise subprocess.TimeoutExpired(command, 300)
+        if process.returncode != 0:
+            if audio_chunks is not None:
+                audio_chunks.clear()  # Áudio incompleto não serve para o Whisper
+            raise subprocess.CalledProcessError(process.returncode, command)
+        if silence_start is not None:  # Silêncio até o fim do arquivo
+            silences.append((silence_start, duration))
+        return duration, silences
+
     def _create_animated_text(self, text, duration, font_name, font_size, color, stroke_color, stroke_width, video_width):
         """Cria um texto com animação de digitação com destaque na palavra atual"""
+        from moviepy import VideoClip, vfx
         try:
             font_path = self.font_manager.get_font_path(font_name)
-            if not font_path or not os.path.exists(font_path):
+            if not font_path:
                 font_path = self.font_manager.get_font_path(self.font_manager.get_default_font())
             
             # Configurações
             highlight_color = '#FFFF00'  # Amarelo para destacar
             base_color = color
-            stroke_settings = {
-                'stroke_color': stroke_color,
-                'stroke_width': int(stroke_width) if stroke_width else 1
-            } if stroke_color and stroke_color.lower() != 'none' else {}
+            stroke_width = int(stroke_width) if stroke_color and stroke_color.lower() != 'none' and stroke_width else 0
+            font = _load_pil_font(font_path, int(font_size))
             
             # Divide o texto em palavras mantendo espaços e pontuação
-            words = re.findall(r'\w+|\s+|[^\w\s]', text)
+            words = _TOKEN_RE.findall(text)
+            word_indices = [i for i, word in enumerate(words) if not word.isspace()]
+            if not word_indices:
+                raise ValueError("Texto sem palavras para animar")
             
-            # Cria clips base
-            base_clip_normal = TextClip(
-                "", font=font_path, font_size=int(font_size),
-                color=base_color, size=(int(video_width * 0.9), None),
-                method='caption', **stroke_settings
-            )
+            # Posição de cada palavra calculada uma única vez (com quebra de linha na largura do vídeo)
+            max_width = int(video_width * 0.9)
+            ascent, descent = font.getmetrics()
+            line_height = ascent + descent + 2 * stroke_width
+            measure = ImageDraw.Draw(Image.new('L', (1, 1)))
+            positions = []
+            x, y = 0, 0
+            for word in words:
+                word_width = measure.textlength(word, font=font)
+                if x and not word.isspace() and x + word_width > max_width:
+                    x, y = 0, y + line_height
+                positions.append((int(x), y, int(word_width) + 2 * stroke_width + 1))
+                x += word_width
+            cursor_width = int(measure.textlength("|", font=font)) + 2 * stroke_width + 1
+            height = y + line_height
+            width = max_width + cursor_width
             
-            base_clip_highlight = TextClip(
-                "", font=font_path, font_size=int(font_size),
-                color=highlight_color, size=(int(video_width * 0.9), None),
-                method='caption', **stroke_settings
-            )
+            # Texto completo renderizado uma vez na cor normal e na cor de destaque (RGBA)
+            def render_layer(fill):
+                layer = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+                draw = ImageDraw.Draw(layer)
+                for word, (word_x, word_y, _) in zip(words, positions):
+                    if not word.isspace():
+                        draw.text((word_x + stroke_width, word_y + stroke_width), word, font=font, fill=fill,
+                                  stroke_width=stroke_width, stroke_fill=stroke_color if stroke_width else None)
+                return np.asarray(layer)
+            
+            normal_layer = render_layer(base_color)
+            highlight_layer = render_layer(highlight_color)
+            cursor = Image.new('RGBA', (cursor_width, line_height), (0, 0, 0, 0))
+            ImageDraw.Draw(cursor).text((stroke_width, stroke_width), "|", font=font, fill=highlight_color,
+                                        stroke_width=stroke_width, stroke_fill=stroke_color if stroke_width else None)
+            cursor = np.asarray(cursor)
             
             # Calcula tempo por palavra
-            total_words = len([w for w in words if w.strip()])
+            total_words = len(word_indices)
             words_per_second = max(1, total_words/duration)
             
-            def make_frame(t):
-                current_word_idx = min(len(words), int(t * words_per_second))
-                if current_word_idx < len(words):
-                    # Suaviza a transição entre palavras
-                    progress = (t * words_per_second) - current_word_idx
-                    if progress > 0.8:  # Começa a mostrar a próxima palavra nos últimos 20% do tempo
-                        current_word_idx += 1
-                displayed_words = words[:current_word_idx]
-                
-                # Separa as palavras já exibidas da palavra atual (se houver)
-                normal_text = ''.join(displayed_words[:-1]) if current_word_idx > 0 else ""
-                current_word = displayed_words[-1] if current_word_idx > 0 else ""
-                
-                # Cria os clips separados
-                if normal_text:
-                    normal_clip = base_clip_normal.with_text(normal_text)
-                    frame = normal_clip.get_frame(t)
+            def compose(shown_words, show_cursor):
+                """Monta o quadro RGBA com as palavras já exibidas e a atual em destaque"""
+                frame = np.zeros_like(normal_layer)
+                if shown_words:
+                    current = word_indices[shown_words - 1]
+                    word_x, word_y, word_w = positions[current]
+                    # Tudo antes da palavra atual: linhas anteriores inteiras + início da linha atual
+                    frame[:word_y] = normal_layer[:word_y]
+                    frame[word_y:word_y + line_height, :word_x] = normal_layer[word_y:word_y + line_height, :word_x]
+                    frame[word_y:word_y + line_height, word_x:word_x + word_w] = \
+                        highlight_layer[word_y:word_y + line_height, word_x:word_x + word_w]
+                    cursor_x, cursor_y = word_x + word_w, word_y
                 else:
-                    frame = base_clip_normal.with_text("").get_frame(t)
-                
-                if current_word:
-                    # Posiciona o clip da palavra destacada
-                    if normal_text:
-                        # Calcula a posição X da palavra atual
-                        temp_clip = base_clip_normal.with_text(normal_text)
-                        try:
-                            normal_width = temp_clip.size[0]
-                        except:
-                            normal_width = len(normal_text) * font_size * 0.6  # Fallback aproximado
-                        current_word_clip = base_clip_highlight.with_text(current_word)
-                        highlight_frame = current_word_clip.get_frame(t)
-                        
-                        # Desenha a palavra destacada na posição correta
-                        x_offset = normal_width
-                        frame[x_offset:x_offset+current_word_clip.size[0], :] = highlight_frame
-                    else:
-                        # Primeira palavra
-                        current_word_clip = base_clip_highlight.with_text(current_word)
-                        frame = current_word_clip.get_frame(t)
-                
-                # Adiciona cursor piscante (opcional)
-                if int(t * 2) % 2 == 0 and current_word_idx < len(words):
-                    cursor = base_clip_highlight.with_text("|").get_frame(t)
-                    cursor_x = frame.shape[1] - 20  # Posição do cursor
-                    frame[cursor_x:cursor_x+10, :] = cursor[:, :10]
-                
+                    cursor_x, cursor_y = 0, 0
+                if show_cursor:
+                    cursor_x = min(cursor_x, width - cursor_width)
+                    frame[cursor_y:cursor_y + line_height, cursor_x:cursor_x + cursor_width] = cursor
                 return frame
-                
-            animated_text = VideoClip(make_frame, duration=duration)
-            return animated_text.crossfadein(0.3).crossfadeout(0.3)
+            
+            frames = {}
+            def get_frame(t):
+                shown_words = min(total_words, int(t * words_per_second))
+                if shown_words < total_words:
+                    # Suaviza a transição entre palavras
+                    progress = (t * words_per_second) - shown_words
+                    if progress > 0.8:  # Começa a mostrar a próxima palavra nos últimos 20% do tempo
+                        shown_words += 1
+                # Cursor piscante enquanto ainda há palavras para exibir
+                state = (shown_words, int(t * 2) % 2 == 0 and shown_words < total_words)
+                if state not in frames:
+                    # RGB e máscara guardados prontos: os quadros seguintes não alocam nada
+                    rgba = compose(*state)
+                    frames[state] = (np.ascontiguousarray(rgba[:, :, :3]),
+                                     rgba[:, :, 3].astype(np.float32) / np.float32(255.0))
+                    # O tempo só avança: estados antigos (palavra anterior) não voltam, então
+                    # só os mais recentes ficam em memória (cursor aceso/apagado da palavra atual)
+                    while len(frames) > 4:
+                        del frames[next(iter(frames))]
+                return frames[state]
+            
+            animated_text = VideoClip(lambda t: get_frame(t)[0], duration=duration)
+            mask = VideoClip(lambda t: get_frame(t)[1], is_mask=True, duration=duration)
+            return animated_text.with_mask(mask).with_effects([vfx.CrossFadeIn(0.3), vfx.CrossFadeOut(0.3)])
             
         except Exception as e:
             print(f"Erro na animação avançada: {e}")
@@ -343,45 +626,248 @@ class VideoProcessor:
     def _fallback_segments(self, video_path):
         """Método alternativo caso a análise de áudio falhe"""
         try:
-            with VideoFileClip(video_path) as clip:
-                duration = clip.duration
-                clip_duration = self.config.get('clip_duration', 45)
-                return [i for i in range(0, int(duration), clip_duration)]
+            duration = self._probe(video_path)['duration']
+            clip_duration = self.config.get('clip_duration', 45)
+            return [i for i in range(0, int(duration), clip_duration)]
         except Exception as e:
             print(f"Erro no fallback: {e}")
             return [0]
 
+    def _copy_clip(self, video_path, start_time, output_path):
+        """Corta o clip por cópia direta dos streams; retorna False se o corte não serviu"""
+        # Corte alinhado ao keyframe anterior, sem decodificar nem recodificar nada
+        command = [
+            "ffmpeg",
+            "-y",
+            *_FFMPEG_QUIET,
+            "-ss", str(start_time),
+            "-i", video_path,
+            "-t", str(self.config['clip_duration']),
+            "-c", "copy",
+            "-avoid_negative_ts", "make_zero",
+            "-movflags", "+faststart",
+            output_path
+        ]
+        try:
+            subprocess.run(command, check=True, timeout=300, **_FFMPEG_RUN_OPTIONS)
+            # Corte que caiu no meio do GOP e ficou curto também não serve
+            expected = min(self.config['clip_duration'], self._probe(video_path)['duration'] - start_time)
+            copied_ok = self._probe(output_path)['duration'] >= expected * 0.9
+            self._probes.pop(output_path, None)
+            return copied_ok
+        except (OSError, subprocess.SubprocessError, KeyError, ValueError) as e:
+            # Inclui ffprobe ausente: cai na recodificação em vez de abortar
+            print(f"Cópia direta falhou: {e}")
+            return False
+
     def create_clip(self, video_path, start_time, output_path):
         """Cria um subclip e o salva no caminho especificado."""
         try:
+            # O clip precisa começar exatamente em start_time (legendas cronometradas a partir dele),
+            # então a cópia direta, que volta até o keyframe anterior, não serve: o clip
+            # intermediário é recodificado o mais rápido possível
             command = [
                 "ffmpeg",
                 "-y",
+                *_FFMPEG_QUIET,
                 "-ss", str(start_time),
                 "-i", video_path,
                 "-t", str(self.config['clip_duration']),
-                "-c:v", "libx264",
-                "-preset", "fast",
-                "-c:a", "aac",
+                "-c:v", "libx264", "-preset", "ultrafast", "-crf", "18",
+                *self._threads_args(),
+                "-c:a", "aac",  # A cópia pode ter falhado justamente pelo codec de áudio
                 "-b:a", "192k",
-                "-ar", "44100",
+                "-avoid_negative_ts", "make_zero",
                 "-movflags", "+faststart",
                 output_path
             ]
-            subprocess.run(command, check=True, timeout=300)
+            subprocess.run(command, check=True, timeout=300, **_FFMPEG_RUN_OPTIONS)
         except subprocess.CalledProcessError as e:
-            print(f"Erro ao executar o comando ffmpeg: {e}")
+            print(f"Erro ao executar o comando ffmpeg: {e}\n{e.stderr}")
             raise
         except subprocess.TimeoutExpired:
             print("Tempo limite excedido para o comando ffmpeg")
             raise
 
+    def create_clips_batch(self, video_path, start_times, output_paths, stop_event=None):
+        """Cria todos os subclips com uma única invocação do ffmpeg (um só demux da entrada), retorna os caminhos gerados"""
+        clips = list(zip(start_times, output_paths))
+        written = []
+        if self.config.get('fast_cut', True):
+            # Corte rápido: cópia direta por clip; só os que falharem são recodificados
+            pending = []
+            for start_time, output_path in clips:
+                if stop_event is not None and stop_event.is_set():
+                    return written
+                if self._copy_clip(video_path, start_time, output_path):
+                    written.append(output_path)
+                else:
+                    pending.append((start_time, output_path))
+            clips = pending
+        if not clips or (stop_event is not None and stop_event.is_set()):
+            return written
+        try:
+            command = ["ffmpeg", "-y", *_FFMPEG_QUIET] + self.video_encoder['input'] + ["-i", video_path]
+            for start_time, output_path in clips:
+                command += [
+                    "-ss", str(start_time),
+                    "-t", str(self.config['clip_duration']),
+                    *self._video_encode_args(),
+                    "-c:a", "aac",
+                    "-b:a", "192k",
+                    "-ar", "44100",
+                    "-movflags", "+faststart",
+                    output_path
+                ]
+            subprocess.run(command, check=True, timeout=300 * max(1, len(clips)), **_FFMPEG_RUN_OPTIONS)
+            return written + [output_path for _, output_path in clips]
+        except subprocess.CalledProcessError as e:
+            print(f"Erro ao executar o comando ffmpeg: {e}\n{e.stderr}")
+            raise
+        except subprocess.TimeoutExpired:
+            print("Tempo limite excedido para o comando ffmpeg")
+            raise
+
+    def write_ass(self, segments, ass_path, subtitle_config, video_path):
+        """Grava os segmentos em um arquivo ASS com o estilo configurado (fonte, cores, contorno, posição)"""
+        width, height = self._get_video_size(video_path)
+        alignments = {'top': 8, 'middle': 5, 'bottom': 2}
+        stroke_color = subtitle_config.get('stroke_color')
+        outline = subtitle_config.get('stroke_width', 1) if stroke_color else 0
+        side_margin = int(width * 0.05)  # Mesma largura útil de 90% usada no MoviePy
+        style = ",".join(str(value) for value in [
+            "Default",
+            subtitle_config.get('font', 'Arial'),
+            int(subtitle_config.get('font_size', 24)),
+            self._to_ass_color(subtitle_config.get('font_color', 'white')),
+            self._to_ass_color(subtitle_config.get('highlight_color', '#FFFF00')),
+            self._to_ass_color(stroke_color or 'black'),
+            "&H00000000",
+            0, 0, 0, 0, 100, 100, 0, 0,
+            1, outline, 0,
+            alignments.get(subtitle_config.get('position', 'bottom'), 2),
+            side_margin, side_margin, 50, 1
+        ])
+        
+        with open(ass_path, 'w', encoding='utf-8') as f:
+            # PlayRes igual à resolução do vídeo para que o tamanho da fonte seja em pixels
+            f.write("[Script Info]\nScriptType: v4.00+\n")
+            f.write(f"PlayResX: {width}\nPlayResY: {height}\n")
+            f.write("ScaledBorderAndShadow: yes\nWrapStyle: 0\n\n")
+            f.write("[V4+ Styles]\n")
+            f.write("Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+                    "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, "
+                    "Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n")
+            f.write(f"Style: {style}\n\n")
+            f.write("[Events]\nFormat: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n")
+            for start, end, text in zip(segments["starts"].tolist(), segments["ends"].tolist(), segments["texts"]):
+                text = text.strip().replace('\n', ' ').replace('{', '(').replace('}', ')')
+                f.write(f"Dialogue: 0,{self._format_ass_time(start)},{self._format_ass_time(end)},Default,,0,0,0,,{text}\n")
+
+    def _format_ass_time(self, seconds):
+        """Converte segundos para o formato H:MM:SS.cc do ASS"""
+        centis = int(round(max(0, seconds) * 100))
+        hours, centis = divmod(centis, 360000)
+        minutes, centis = divmod(centis, 6000)
+        secs, centis = divmod(centis, 100)
+        return f"{hours}:{minutes:02d}:{secs:02d}.{centis:02d}"
+
+    def _probe(self, video_path):
+        """Lê duração, resolução e fps do vídeo com um único ffprobe, com cache por arquivo"""
+        if video_path not in self._probes:
+            result = subprocess.run(
+                ["ffprobe", "-v", "error", "-select_streams", "v:0", "-print_format", "json",
+                 "-show_format", "-show_streams", video_path],
+                capture_output=True, text=True, check=True, timeout=30
+            )
+            info = json.loads(result.stdout)
+            stream = info['streams'][0]
+            num, _, den = stream.get('avg_frame_rate', '0/0').partition('/')
+            self._probes[video_path] = {
+                'duration': float(info['format']['duration']),
+                'width': int(stream['width']),
+                'height': int(stream['height']),
+                'fps': float(num) / float(den) if den and float(den) else None
+            }
+        return self._probes[video_path]
+
+    def _get_video_size(self, video_path):
+        """Obtém (largura, altura) do vídeo via ffprobe"""
+        try:
+            probe = self._probe(video_path)
+            return (probe['width'], probe['height'])
+        except Exception as e:
+            print(f"Erro ao obter resolução do vídeo: {e}")
+            return (384, 288)  # Resolução padrão do libass
+
+    def _to_ass_color(self, color):
+        """Converte nome ou #RRGGBB para o formato de cor do ASS (&H00BBGGRR)"""
+        named_colors = {
+            'white': '#FFFFFF', 'yellow': '#FFFF00', 'black': '#000000',
+            'red': '#FF0000', 'green': '#00FF00', 'blue': '#0000FF'
+        }
+        hex_color = named_colors.get(str(color).lower(), color)
+        if not re.fullmatch(r'#[0-9A-Fa-f]{6}', str(hex_color)):
+            hex_color = '#FFFFFF'
+        r, g, b = hex_color[1:3], hex_color[3:5], hex_color[5:7]
+        return f"&H00{b}{g}{r}".upper()
+
+    def _escape_filter_path(self, path):
+        """Escapa e cita um caminho de arquivo para uso como opção de um filtro do ffmpeg"""
+        # Dois níveis: a opção do filtro escapa ':' e "'" com barra invertida, e o grafo de
+        # filtros recebe tudo entre aspas simples, onde uma aspa literal vira '\''
+        option = path.replace('\\', '/').replace(':', '\\:').replace("'", "\\'")
+        return "'" + option.replace("'", "'\\''") + "'"
+
+    def create_subtitled_clip(self, video_path, start_time, output_path, ass_path, subtitle_config):
+        """Corta o clip e grava as legendas em uma única passada do ffmpeg"""
+        try:
+            # fontsdir aponta para a pasta da fonte escolhida para o libass encontrá-la
+            font_path = self.font_manager.get_font_path(subtitle_config.get('font', 'Arial'))
+            subtitles_filter = f"ass={self._escape_filter_path(ass_path)}"
+            if font_path:
+                subtitles_filter += f":fontsdir={self._escape_filter_path(os.path.dirname(font_path))}"
+            command = [
+                "ffmpeg",
+                "-y",
+                *_FFMPEG_QUIET,
+                *self.video_encoder['input'],
+                "-ss", str(start_time),
+                "-i", video_path,
+                "-t", str(self.config['clip_duration']),
+                *self._video_encode_args(subtitles_filter),
+                "-c:a", "copy",  # Mantém o áudio original, sem reencode
+                "-movflags", "+faststart",
+                output_path
+            ]
+            try:
+                subprocess.run(command, check=True, timeout=300, **_FFMPEG_RUN_OPTIONS)
+            except subprocess.CalledProcessError as e:
+                # Áudio que o MP4 não aceita (ex.: Vorbis de um .mkv): o muxer falha logo no
+                # cabeçalho, então refaz convertendo o áudio para AAC. Outros erros sobem direto
+                if not _MUXER_CODEC_RE.search(e.stderr or ""):
+                    raise
+                print("Cópia do áudio falhou, convertendo para AAC")
+                audio_index = command.index("-c:a")
+                command[audio_index:audio_index + 2] = ["-c:a", "aac", "-b:a", "192k"]
+                subprocess.run(command, check=True, timeout=300, **_FFMPEG_RUN_OPTIONS)
+        except subprocess.CalledProcessError as e:
+            print(f"Erro ao gravar legendas com ffmpeg: {e}\n{e.stderr}")
+            raise
+        except subprocess.TimeoutExpired:
+            print("Tempo limite excedido para gravar legendas")
+            raise
+
     def add_subtitles_to_video(self, video_path, output_path, segments, subtitle_config):
-        """Adiciona legendas ao vídeo com tratamento robusto de fontes"""
+        """Adiciona legendas ao vídeo com tratamento robusto de fontes (áudio copiado do original)"""
+        from moviepy import VideoFileClip, CompositeVideoClip
         try:
             with VideoFileClip(video_path) as video:
-                subtitle_clips = []
-                for segment in segments:
+                # O vídeo base abre a lista: o CompositeVideoClip a recebe sem cópia
+                layers = [video]
+                # Frases repetidas reaproveitam o TextClip já rasterizado
+                text_clip_cache = {}
+                for text, start, end in zip(segments["texts"], segments["starts"].tolist(), segments["ends"].tolist()):
                     try:
                         # Configurações com fallback
                         font = subtitle_config.get('font', 'Arial')
@@ -393,8 +879,8 @@ class VideoProcessor:
                         
                         if use_animation:
                             text_clip = self._create_animated_text(
-                                text=segment["text"],
-                                duration=segment["end"] - segment["start"],
+                                text=text,
+                                duration=end - start,
                                 font_name=font,
                                 font_size=font_size,
                                 color=color,
@@ -403,41 +889,57 @@ class VideoProcessor:
                                 video_width=video.w
                             )
                         else:
-                            text_clip = self._create_text_clip(
-                                text=segment["text"],
-                                font_name=font,
-                                font_size=font_size,
-                                video_width=video.w,
-                                color=color,
-                                stroke_color=stroke_color,
-                                stroke_width=stroke_width
-                            )
+                            cache_key = (text, font, font_size, color, stroke_color, stroke_width)
+                            text_clip = text_clip_cache.get(cache_key)
+                            if text_clip is None:
+                                text_clip = self._create_text_clip(
+                                    text=text,
+                                    font_name=font,
+                                    font_size=font_size,
+                                    video_width=video.w,
+                                    color=color,
+                                    stroke_color=stroke_color,
+                                    stroke_width=stroke_width
+                                )
+                                text_clip_cache[cache_key] = text_clip
                         
                         position = self._get_subtitle_position(
                             subtitle_config.get('position', 'bottom'),
                             video.h
                         )
                         
-                        subtitle_clip = text_clip.with_position(position).with_start(segment["start"])
+                        subtitle_clip = text_clip.with_position(position).with_start(start)
                         if not use_animation:
-                            subtitle_clip = subtitle_clip.with_duration(segment["end"] - segment["start"])
+                            subtitle_clip = subtitle_clip.with_duration(end - start)
                         
-                        subtitle_clips.append(subtitle_clip)
+                        layers.append(subtitle_clip)
                     except Exception as e:
                         print(f"Erro ao criar legenda para segmento: {str(e)}")
                         continue
 
-                if subtitle_clips:
-                    final_video = CompositeVideoClip([video] + subtitle_clips)
+                if len(layers) > 1:
+                    final_video = CompositeVideoClip(layers)
+                    # Os quadros chegam crus pelo pipe: serve qualquer encoder que não
+                    # dependa de filtro de upload para a GPU (caso do VAAPI)
+                    if self.video_encoder['name'] != 'libx264' and not self.video_encoder['filter']:
+                        codec = self.video_encoder['name']
+                        encoder_params = self.video_encoder['output'][2:]
+                        bitrate = None  # O controle de taxa já vem nas opções do encoder
+                    else:
+                        codec = "libx264"
+                        encoder_params = ['-crf', '18']  # Qualidade visual (18-28 é bom)
+                        bitrate = "8000k"  # Ajuste conforme necessário
+                    # O MoviePy anexa o arquivo de áudio com -acodec copy; os -map garantem
+                    # que o vídeo venha dos quadros renderizados e o áudio do clip original
                     final_video.write_videofile(
                         output_path,
-                        codec="libx264",
-                        audio_codec="aac",
+                        codec=codec,
+                        audio=video_path,
                         fps=video.fps,
-                        threads=4,
+                        threads=self.ffmpeg_threads,
                         preset='medium',  # Melhor qualidade que 'fast'
-                        bitrate="8000k",  # Ajuste conforme necessário
-                        ffmpeg_params=['-crf', '18']  # Qualidade visual (18-28 é bom)
+                        bitrate=bitrate,
+                        ffmpeg_params=encoder_params + ['-map', '0:v:0', '-map', '1:a:0']
                     )
                 else:
                     raise ValueError("Nenhuma legenda pôde ser criada")
@@ -453,27 +955,38 @@ class VideoProcessor:
         else:  # bottom
             return ('center', video_height - 100)
 
-    def _extract_audio_to_wav(self, video_path, temp_audio_path):
-        """Extrai áudio do vídeo para arquivo WAV temporário"""
+    def _extract_audio_array(self, video_path, sample_rate=16000):
+        """Extrai o áudio mono do vídeo direto da memória, pronto para o Whisper"""
+        # 16 kHz é a taxa usada internamente pelo Whisper
         try:
             command = [
                 "ffmpeg",
-                "-y",
+                *_FFMPEG_QUIET,
                 "-i", video_path,
                 "-vn",
+                "-f", "s16le",
                 "-acodec", "pcm_s16le",
-                "-ar", "44100",
-                temp_audio_path
+                "-ac", "1",
+                "-ar", str(sample_rate),
+                "pipe:1"
             ]
-            subprocess.run(command, check=True, timeout=300)
+            result = subprocess.run(command, check=True, timeout=300, capture_output=True)
+            return self._pcm_to_whisper_audio(result.stdout)
         except subprocess.CalledProcessError as e:
-            print(f"Erro ao extrair áudio: {e}")
+            print(f"Erro ao extrair áudio: {e}\n{e.stderr.decode('utf-8', errors='replace')}")
             raise
         except subprocess.TimeoutExpired:
             print("Tempo limite excedido para extração de áudio")
             raise
 
+    def _pcm_to_whisper_audio(self, pcm):
+        """Converte PCM s16le para o array float32 em [-1, 1] aceito pelo Whisper"""
+        return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
 class VideoProcessorApp:
+    # Modelos Whisper carregados, por (nome, dispositivo); compartilhados entre instâncias da janela
+    _model_cache = {}
+
     def __init__(self, root):
         self.root = root
         self.app_dir = os.path.dirname(os.path.abspath(__file__))
@@ -491,6 +1004,7 @@ class VideoProcessorApp:
         self._setup_ui()
         self._initialize_variables()
         self._load_auto_settings()  # Carrega as configurações existentes
+        self._load_available_fonts()
         
         root.protocol("WM_DELETE_WINDOW", self._on_close)
 
@@ -503,6 +1017,8 @@ class VideoProcessorApp:
             'silence_threshold': -40,
             'min_silence_len': 1.0,
             'safety_margin': 0.5,
+            'video_codec': 'auto',
+            'fast_cut': True,
             'add_subtitles': True,
             'font': 'Arial',
             'font_size': 24,
@@ -510,16 +1026,19 @@ class VideoProcessorApp:
             'stroke_color': 'black',
             'position': 'bottom',
             'last_video_path': '',
-            'animation': True,
+            'animation': False,
             'highlight_color': '#FFFF00',
             'animation_style': 'Digitação com Destaque'
         }
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(default_config, f, indent=4)
+        with open(CONFIG_FILE, 'wb') as f:
+            f.write(_json_dumps(default_config, pretty=True))
     def _initialize_variables(self):
         """Inicializa variáveis e gerenciadores"""
         self.model = None
         self.progress_queue = queue.Queue()
+        self._drain_pending = False
+        self._autosave_after_id = None
+        self._available_fonts = frozenset()  # Preenchido quando a varredura de fontes termina
         self.processing_thread = None
         self.stop_event = threading.Event()
         self.last_clip_path = None
@@ -564,6 +1083,10 @@ class VideoProcessorApp:
         self.add_subtitles_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(settings_frame, variable=self.add_subtitles_var).grid(row=1, column=1, padx=5, sticky=tk.W)
 
+        ttk.Label(settings_frame, text="Corte rápido (sem recodificar):").grid(row=1, column=2, sticky=tk.W)
+        self.fast_cut_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(settings_frame, variable=self.fast_cut_var).grid(row=1, column=3, padx=5, sticky=tk.W)
+
         # Configurações avançadas
         advanced_frame = ttk.LabelFrame(main_frame, text="Configurações Avançadas de Corte", padding=10)
         advanced_frame.grid(row=3, column=0, columnspan=3, sticky=tk.EW, pady=5)
@@ -572,13 +1095,18 @@ class VideoProcessorApp:
         self._create_slider(advanced_frame, "Duração Mínima (s):", 1, 1.0, 40.0, 1.0)
         self._create_slider(advanced_frame, "Margem Segurança (s):", 2, 0, 1.0, 0.5)
 
+        ttk.Label(advanced_frame, text="Codec de Vídeo:").grid(row=3, column=0, sticky=tk.W)
+        self.video_codec_combo = ttk.Combobox(advanced_frame, values=_VIDEO_CODEC_OPTIONS, state="readonly")
+        self.video_codec_combo.set('auto')
+        self.video_codec_combo.grid(row=3, column=1, padx=5, sticky=tk.W)
+
         # Configurações de legendas
         self.subtitle_frame = self._create_subtitle_settings(main_frame)
         self.subtitle_frame.grid(row=4, column=0, columnspan=3, sticky=tk.EW, pady=5)
 
         # Área de log
         ttk.Label(main_frame, text="Log de Execução:").grid(row=5, column=0, sticky=tk.W)
-        self.log_text = tk.Text(main_frame, height=10, width=70)
+        self.log_text = tk.Text(main_frame, height=10, width=70, state=tk.DISABLED)
         self.log_text.grid(row=6, column=0, columnspan=3, sticky=tk.EW, pady=5)
 
         # Botões de controle
@@ -646,13 +1174,15 @@ class VideoProcessorApp:
         self.highlight_color.grid(row=6, column=1, padx=5, sticky=tk.W)
         # Adicione este novo controle no final:
         ttk.Label(frame, text="Animação:").grid(row=5, column=0, sticky=tk.W)
-        self.animation_var = tk.BooleanVar(value=True)
+        # Desligada por padrão: a animação passa pelo MoviePy, bem mais lento que o ASS gravado pelo ffmpeg
+        self.animation_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(frame, text="Ativar animação", variable=self.animation_var).grid(row=5, column=1, sticky=tk.W)
         # Configurações de fonte
         ttk.Label(frame, text="Fonte:").grid(row=0, column=0, sticky=tk.W)
         self.font_combo = ttk.Combobox(frame, state="readonly")
-        self.font_combo['values'] = self.font_manager.get_available_fonts()
-        self.font_combo.set('Arial' if 'Arial' in self.font_combo['values'] else self.font_combo['values'][0])
+        # A lista completa é preenchida em segundo plano por _load_available_fonts
+        self.font_combo['values'] = ['Arial']
+        self.font_combo.set('Arial')
         self.font_combo.grid(row=0, column=1, padx=5, sticky=tk.EW)
         
         # Tamanho da fonte
@@ -682,15 +1212,14 @@ class VideoProcessorApp:
         return frame
 
     def _load_available_fonts(self):
+        """Dispara a varredura de fontes em segundo plano para não travar a interface"""
+        threading.Thread(target=self._load_available_fonts_worker, daemon=True).start()
+
+    def _load_available_fonts_worker(self):
         """Carrega fontes disponíveis de forma confiável"""
         try:
-            all_fonts = self.font_manager.get_available_fonts()
-            
-            # Verificar disponibilidade das fontes
-            available_fonts = []
-            for font in all_fonts:
-                if self.font_manager.is_font_available(font):
-                    available_fonts.append(font)
+            # A lista já vem filtrada pelas fontes que o PIL consegue carregar (e salva em cache)
+            available_fonts = self.font_manager.get_available_fonts()
             
             # Ordenar colocando as comuns primeiro
             common_fonts = ['Arial', 'Courier New', 'Times New Roman', 'Verdana', 'Helvetica']
@@ -698,20 +1227,26 @@ class VideoProcessorApp:
                 available_fonts, 
                 key=lambda x: (x not in common_fonts, x)
             )
-            
-            self.font_combo['values'] = font_list
-            
-            # Definir fonte padrão segura
             safe_fonts = [f for f in common_fonts if f in font_list]
-            if safe_fonts:
-                self.font_combo.set(safe_fonts[0])
-            else:
-                self.font_combo.set(font_list[0] if font_list else 'Arial')
-                
         except Exception as e:
             print(f"Erro ao carregar fontes: {e}")
-            self.font_combo['values'] = ['Arial']
-            self.font_combo.set('Arial')
+            font_list, safe_fonts = [], []
+        
+        # Widgets só podem ser alterados na thread do Tk
+        self.root.after(0, self._apply_font_list, font_list, safe_fonts)
+
+    def _apply_font_list(self, font_list, safe_fonts):
+        """Preenche o combobox de fontes com o resultado da varredura"""
+        self._available_fonts = frozenset(font_list)
+        self.font_combo['values'] = font_list or ['Arial']
+        
+        # Mantém a fonte salva nas configurações se ela estiver disponível
+        if self.font_combo.get() in font_list:
+            return
+        if safe_fonts:
+            self.font_combo.set(safe_fonts[0])
+        else:
+            self.font_combo.set(font_list[0] if font_list else 'Arial')
 
     def _update_font_style(self, event=None):
         """Atualiza o estilo da fonte no Combobox"""
@@ -736,15 +1271,21 @@ class VideoProcessorApp:
 
     def _log_message(self, message):
         """Adiciona mensagem ao log"""
+        # O log fica somente leitura; só é liberado durante a inserção
+        self.log_text.config(state=tk.NORMAL)
         self.log_text.insert(tk.END, message + "\n")
+        self.log_text.config(state=tk.DISABLED)
         self.log_text.see(tk.END)
-        self.root.update_idletasks()
 
     def _preview_last_clip(self):
         """Reproduz o último clip processado"""
         if self.last_clip_path and os.path.exists(self.last_clip_path):
             try:
-                subprocess.Popen(["ffplay", "-autoexit", "-window_title", "Pré-visualização", self.last_clip_path])
+                # O clip é um MP4 gerado aqui: dispensa a sondagem longa e o buffer iniciais do ffplay
+                subprocess.Popen(["ffplay", "-autoexit", "-fflags", "nobuffer", "-flags", "low_delay",
+                                  "-probesize", "32", "-analyzeduration", "0",
+                                  "-loglevel", "quiet", "-window_title", "Pré-visualização", self.last_clip_path],
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             except Exception as e:
                 self._log_message(f"Erro ao reproduzir pré-visualização: {e}")
         else:
@@ -768,7 +1309,9 @@ class VideoProcessorApp:
             'silence_threshold': float(self.silence_threshold_slider.get()),
             'min_silence_len': float(self.min_silence_len_slider.get()),
             'safety_margin': float(self.safety_margin_slider.get()),
-            'add_subtitles': self.add_subtitles_var.get()
+            'add_subtitles': self.add_subtitles_var.get(),
+            'video_codec': self.video_codec_combo.get(),
+            'fast_cut': self.fast_cut_var.get()
         }
 
         try:
@@ -776,7 +1319,9 @@ class VideoProcessorApp:
             self.process_btn.config(state=tk.DISABLED)
             self.preview_btn.config(state=tk.DISABLED)
             self.cancel_btn.config(state=tk.NORMAL)
+            self.log_text.config(state=tk.NORMAL)
             self.log_text.delete(1.0, tk.END)
+            self.log_text.config(state=tk.DISABLED)
             self.progress['value'] = 0
             
             self.processing_thread = threading.Thread(
@@ -786,7 +1331,7 @@ class VideoProcessorApp:
             )
             self.processing_thread.start()
             
-            self.root.after(100, self._update_progress)
+            self.root.after(500, self._watch_processing)
             
         except Exception as e:
             messagebox.showerror("Erro", f"Falha ao iniciar processamento: {str(e)}")
@@ -795,118 +1340,229 @@ class VideoProcessorApp:
     def _run_processing(self, video_path, settings):
         """Executa o processamento do vídeo em uma thread separada"""
         try:
-            self.progress_queue.put(("log", "Iniciando processamento..."))
-            self.progress_queue.put(("progress", 0))
+            self._post("log", "Iniciando processamento...")
+            self._post("progress", 0)
             
-            # Verificar fontes disponíveis
+            video_dir = os.path.dirname(video_path)
+            video_name = os.path.splitext(os.path.basename(video_path))[0]
+            output_dir = os.path.join(video_dir, "cortes_com_legendas" if settings['add_subtitles'] else "cortes_sem_legendas")
+            os.makedirs(output_dir, exist_ok=True)
+            
+            # Temporários ficam no mesmo sistema de arquivos dos clips finais
+            self.temp_manager.cleanup()
+            self.temp_manager = TempFileManager(base_dir=output_dir)
+
             processor = VideoProcessor(settings, self.temp_manager, self.font_manager)
-            processor.check_fonts()
+            self._post("log", f"Encoder de vídeo: {processor.video_encoder['name']}")
             
             if settings['add_subtitles']:
+                # Verificar fontes disponíveis (só interessa quando há legendas)
+                processor.check_fonts()
                 selected_font = self.font_combo.get()
-                if not self.font_manager.is_font_available(selected_font):
-                    self.progress_queue.put(("log", f"Aviso: Fonte '{selected_font}' não encontrada, usando Arial como fallback"))
+                # A varredura já validou as fontes da lista; só consulta o FontManager fora dela
+                if selected_font not in self._available_fonts and not self.font_manager.is_font_available(selected_font):
+                    self._post("log", f"Aviso: Fonte '{selected_font}' não encontrada, usando Arial como fallback")
                     selected_font = 'Arial'
                     
+                # Lido dos widgets uma única vez e compartilhado por todos os clips
                 subtitle_config = {
-                    'font': self.font_combo.get(),
+                    'font': selected_font,
                     'font_size': int(self.font_size.get()),
                     'font_color': self.font_color.get(),
                     'stroke_color': None if self.stroke_color.get() == 'none' else self.stroke_color.get(),
                     'stroke_width': 1.5,
                     'position': self.sub_position.get(),
-                    'animation': self.animation_var.get()  # Nova configuração
+                    'animation': self.animation_var.get()
                 }
-                self.progress_queue.put(("log", "Carregando modelo Whisper..."))
-                device = "cuda" if settings.get('use_gpu', False) else "cpu"
-                self.model = whisper.load_model(settings['whisper_model'], device=device)
-                self.progress_queue.put(("log", f"Modelo {settings['whisper_model']} carregado com sucesso no dispositivo {device.upper()}!"))
-            
-            processor = VideoProcessor(settings, self.temp_manager, self.font_manager)
+                device = "cuda" if settings.get('use_gpu', False) and ctranslate2.get_cuda_device_count() > 0 else "cpu"
+                model_key = (settings['whisper_model'], device)
+                if model_key in self._model_cache:
+                    self.model = self._model_cache[model_key]
+                    self._post("log", f"Reutilizando modelo {settings['whisper_model']} já carregado ({device.upper()})")
+                else:
+                    self._post("log", "Carregando modelo Whisper...")
+                    # CTranslate2 com pesos quantizados em int8 (ativações em float16 na GPU)
+                    compute_type = "int8_float16" if device == "cuda" else "int8"
+                    self.model = WhisperModel(settings['whisper_model'], device=device, compute_type=compute_type,
+                                              cpu_threads=_WHISPER_CPU_THREADS, num_workers=1)
+                    if device == "cuda":
+                        # Na GPU os trechos de fala são decodificados em lotes
+                        self.model = BatchedInferencePipeline(model=self.model)
+                    self._model_cache[model_key] = self.model
+                    self._post("log", f"Modelo {settings['whisper_model']} carregado com sucesso no dispositivo {device.upper()}!")
             
-            video_dir = os.path.dirname(video_path)
-            video_name = os.path.splitext(os.path.basename(video_path))[0]
-            output_dir = os.path.join(video_dir, "cortes_com_legendas" if settings['add_subtitles'] else "cortes_sem_legendas")
-            os.makedirs(output_dir, exist_ok=True)
-
-            self.progress_queue.put(("log", "Analisando vídeo para encontrar segmentos..."))
-            moments = processor.find_interesting_segments(video_path)
-            self.progress_queue.put(("log", f"Encontrados {len(moments)} segmentos interessantes"))
+            self._post("log", "Analisando vídeo para encontrar segmentos...")
+            audio_chunks = [] if settings['add_subtitles'] else None
+            moments = processor.find_interesting_segments(video_path, audio_chunks)
+            self._post("log", f"Encontrados {len(moments)} segmentos interessantes")
             
             total_clips = len(moments)
-            for i, start_time in enumerate(moments):
-                if self.stop_event.is_set():
-                    self.progress_queue.put(("log", "Processamento cancelado pelo usuário"))
-                    break
+            if not settings['add_subtitles']:
+                # Sem legendas: cópia direta por clip (corte rápido) ou todos recodificados numa única leitura do vídeo
+                self._post("log", f"Cortando {total_clips} clips...")
+                clip_paths = [os.path.join(output_dir, f"{video_name}_clip_{i + 1}.mp4") for i in range(total_clips)]
+                written = set(processor.create_clips_batch(video_path, moments, clip_paths, self.stop_event))
                 
-                progress = (i + 1) / total_clips * 100
-                self.progress_queue.put(("progress", progress))
-                self.progress_queue.put(("log", f"\nProcessando segmento {i+1}/{len(moments)} (início em {start_time:.2f}s)..."))
+                for i, final_clip_path in enumerate(clip_paths):
+                    if final_clip_path not in written:
+                        continue
+                    self._post("progress", (i + 1) / total_clips * 100)
+                    self.last_clip_path = final_clip_path
+                    self._post("log", f"Clip {i+1} (sem legendas) salvo em: {final_clip_path}")
                 
-                clip_title = f"{video_name}_clip_{i + 1}"
-                final_clip_path = os.path.join(output_dir, f"{clip_title}.mp4")
-                processor.create_clip(video_path, start_time, final_clip_path)
-                self.last_clip_path = final_clip_path
+                if self.stop_event.is_set():
+                    self._post("log", "Processamento cancelado pelo usuário")
+            else:
+                # Transcreve o áudio completo uma única vez e depois fatia por clip
+                if audio_chunks:
+                    audio = processor._pcm_to_whisper_audio(b"".join(audio_chunks))
+                else:
+                    # A análise de silêncio falhou e não entregou o áudio
+                    audio = processor._extract_audio_array(video_path)
+                # Só o áudio dentro das janelas dos clips é usado: o resto vira silêncio
+                # e o filtro VAD do Whisper nem chega a decodificá-lo (timestamps preservados)
+                in_clips = np.zeros(len(audio), dtype=bool)
+                for start_time in moments:
+                    in_clips[int(start_time * 16000):int((start_time + settings['clip_duration']) * 16000)] = True
+                audio[~in_clips] = 0
+                self._post("log", "Transcrevendo áudio...")
+                batch_options = {"batch_size": 16} if isinstance(self.model, BatchedInferencePipeline) else {}
+                # Decodificação gulosa (beam_size=1): bem mais rápida que o beam search padrão de 5
+                segments, _ = self.model.transcribe(audio, language="pt", word_timestamps=True, vad_filter=True,
+                                                    beam_size=1, **batch_options)
                 
-                if settings['add_subtitles']:
-                    subtitle_config = {
-                        'font': self.font_combo.get(),
-                        'font_size': int(self.font_size.get()),
-                        'font_color': self.font_color.get(),
-                        'stroke_color': None if self.stroke_color.get() == 'none' else self.stroke_color.get(),
-                        'stroke_width': 1.5,
-                        'position': self.sub_position.get()
-                    }
-                    
-                    temp_audio_path = self.temp_manager.create_temp_file(suffix=".wav", prefix=f"audio_{i}_")
-                    processor._extract_audio_to_wav(final_clip_path, temp_audio_path)
-                    
-                    self.progress_queue.put(("log", "Transcrevendo áudio..."))
-                    result = self.model.transcribe(temp_audio_path, language="pt", word_timestamps=True)
+                # Os encodes dos clips são independentes e rodam em paralelo
+                max_workers = max(1, min((os.cpu_count() or 2) // 2, total_clips))
+                if any(encoder['name'] == processor.video_encoder['name'] for encoder in _HW_H264_ENCODERS):
+                    max_workers = min(max_workers, _HW_MAX_CONCURRENT_ENCODES)
+                # Divide os núcleos reservados ao ffmpeg entre os encodes simultâneos (o Whisper segue rodando)
+                processor.ffmpeg_threads = max(1, _FFMPEG_THREADS // max_workers)
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {}
+                    try:
+                        starts, ends, texts = [], [], []
+                        next_clip = 0
+                        # Os segmentos chegam em ordem: um clip cuja janela já foi toda transcrita
+                        # começa a ser renderizado enquanto o Whisper continua no resto do áudio
+                        for segment in segments:
+                            if self.stop_event.is_set():
+                                break
+                            while next_clip < total_clips and segment.start >= moments[next_clip] + settings['clip_duration']:
+                                full_result = {"starts": np.array(starts, dtype=np.float64), "ends": np.array(ends, dtype=np.float64), "texts": texts}
+                                future = self._submit_subtitled_clip(executor, processor, next_clip, video_path, moments[next_clip],
+                                                                     full_result, settings, subtitle_config, output_dir)
+                                futures[future] = next_clip
+                                next_clip += 1
+                            starts.append(segment.start)
+                            ends.append(segment.end)
+                            texts.append(segment.text)
                     
-                    relevant_segments = self._process_transcription_result(result, settings['clip_duration'])
+                        full_result = {"starts": np.array(starts, dtype=np.float64), "ends": np.array(ends, dtype=np.float64), "texts": texts}
+                        for i in range(next_clip, total_clips):
+                            if self.stop_event.is_set():
+                                break
+                            future = self._submit_subtitled_clip(executor, processor, i, video_path, moments[i],
+                                                                 full_result, settings, subtitle_config, output_dir)
+                            futures[future] = i
                     
-                    transcription_text = " ".join([seg["text"] for seg in relevant_segments])
-                    video_title = self._extract_keywords(transcription_text)
-                    self.progress_queue.put(("log", f"Título sugerido: {video_title}"))
-
-                    temp_clip_with_subtitles = self.temp_manager.create_temp_file(suffix=".mp4", prefix=f"clip_{i}_subs_")
-                    processor.add_subtitles_to_video(final_clip_path, temp_clip_with_subtitles, relevant_segments, subtitle_config)
-
-                    final_clip_with_subtitles = os.path.join(output_dir, f"{video_title}_clip_{i + 1}.mp4")
-                    self._restore_audio_format(final_clip_path, temp_clip_with_subtitles, final_clip_with_subtitles)
-                    
-                    os.remove(final_clip_path)
-                    self.last_clip_path = final_clip_with_subtitles
-                    self.progress_queue.put(("log", f"Clip {i+1} (com legendas) salvo em: {final_clip_with_subtitles}"))
-                else:
-                    self.progress_queue.put(("log", f"Clip {i+1} (sem legendas) salvo em: {final_clip_path}"))
+                        for done, future in enumerate(as_completed(futures), start=1):
+                            if self.stop_event.is_set():
+                                for pending in futures:
+                                    pending.cancel()
+                                break
+                            final_clip_with_subtitles = future.result()
+                            self.last_clip_path = final_clip_with_subtitles
+                            self._post("progress", done / total_clips * 100)
+                            self._post("log", f"Clip {futures[future]+1} (com legendas) salvo em: {final_clip_with_subtitles}")
+                    except Exception:
+                        # Uma falha interrompe o processamento como no laço serial: os clips ainda na fila não são gerados
+                        for pending in futures:
+                            pending.cancel()
+                        raise
+                
+                if self.stop_event.is_set():
+                    self._post("log", "Processamento cancelado pelo usuário")
 
             if not self.stop_event.is_set():
-                self.progress_queue.put(("complete", None))
-                self._save_auto_settings()
+                self._post("complete", None)
             
         except Exception as e:
-            self.progress_queue.put(("error", str(e)))
+            self._post("error", str(e))
+        finally:
+            # Não deixa a pasta temporária dentro do diretório de saída
+            self.temp_manager.cleanup()
+
+    def _submit_subtitled_clip(self, executor, processor, index, video_path, start_time, full_result, settings,
+                               subtitle_config, output_dir):
+        """Prepara as legendas de um clip a partir da transcrição e agenda sua renderização"""
+        self._post("log", f"\nProcessando segmento {index+1} (início em {start_time:.2f}s)...")
+        result = self._slice_transcription(full_result, start_time, settings['clip_duration'])
+        relevant_segments = self._process_transcription_result(result, settings['clip_duration'])
+        
+        transcription_text = " ".join(relevant_segments["texts"])
+        video_title = self._extract_keywords(transcription_text)
+        self._post("log", f"Título sugerido: {video_title}")
+        
+        final_clip_with_subtitles = os.path.join(output_dir, f"{video_title}_clip_{index + 1}.mp4")
+        return executor.submit(
+            self._render_subtitled_clip, processor, index, video_path, start_time,
+            final_clip_with_subtitles, relevant_segments, subtitle_config
+        )
+
+    def _render_subtitled_clip(self, processor, index, video_path, start_time, output_path, relevant_segments, subtitle_config):
+        """Gera um clip com legendas (executado nas threads do pool) e retorna o caminho final"""
+        if subtitle_config.get('animation'):
+            # Legendas animadas ainda dependem do MoviePy
+            clip_path = self.temp_manager.create_temp_file(suffix=".mp4", prefix=f"clip_{index}_")
+            processor.create_clip(video_path, start_time, clip_path)
+            processor.add_subtitles_to_video(clip_path, output_path, relevant_segments, subtitle_config)
+        else:
+            # Corte + legendas em uma única passada do ffmpeg
+            ass_path = self.temp_manager.create_temp_file(suffix=".ass", prefix=f"subs_{index}_")
+            processor.write_ass(relevant_segments, ass_path, subtitle_config, video_path)
+            processor.create_subtitled_clip(video_path, start_time, output_path, ass_path, subtitle_config)
+        return output_path
+
+    def _slice_transcription(self, result, start_time, clip_duration):
+        """Seleciona os segmentos da transcrição completa que caem no clip, com tempos relativos ao clip"""
+        end_time = start_time + clip_duration
+        # Os segmentos vêm em ordem cronológica: basta uma busca binária pelos limites do clip
+        first = np.searchsorted(result["starts"], start_time, side='left')
+        last = np.searchsorted(result["starts"], end_time, side='left')
+        return {
+            "starts": result["starts"][first:last] - start_time,
+            "ends": np.minimum(result["ends"][first:last], end_time) - start_time,
+            "texts": result["texts"][first:last]
+        }
 
     def _process_transcription_result(self, result, clip_duration):
         """Processa o resultado da transcrição com tempos precisos"""
-        relevant_segments = []
+        max_duration = 5.0  # segundos por segmento
         
-        for segment in result["segments"]:
-            text = segment["text"].strip()
-            start = segment["start"]
-            end = segment["end"]
+        # Descarta ruídos de uma vez com uma máscara sobre os arrays
+        stripped = [text.strip() for text in result["texts"]]
+        keep = np.fromiter((len(text) >= 3 and text not in _SKIP_TEXTS for text in stripped),
+                           dtype=bool, count=len(stripped))
+        kept = np.flatnonzero(keep)
+        
+        if not ((result["ends"][kept] - result["starts"][kept]) > max_duration).any():
+            # Caso comum: nenhum segmento precisa ser dividido
+            if not kept.size:
+                return {"starts": np.array([0.0]), "ends": np.array([float(clip_duration)]), "texts": ["[Conteúdo não verbal]"]}
+            return {
+                "starts": result["starts"][kept],
+                "ends": result["ends"][kept],
+                "texts": [stripped[i] for i in kept]
+            }
+        
+        starts, ends, texts = [], [], []
+        for i in kept.tolist():
+            text, start, end = stripped[i], float(result["starts"][i]), float(result["ends"][i])
             
-            if len(text) < 3 or text in ["...", "[música]", "[risos]"]:
-                continue
-                
             # Divide textos muito longos em múltiplos segmentos
-            max_duration = 5.0  # segundos por segmento
             if (end - start) > max_duration:
                 words = text.split()
                 word_duration = (end - start) / len(words)
-                chunks = []
                 current_chunk = []
                 current_duration = 0
                 
@@ -914,101 +1570,95 @@ class VideoProcessorApp:
                     current_chunk.append(word)
                     current_duration += word_duration
                     
-                    if current_duration >= max_duration or word[-1] in ".!?":
-                        chunk_text = " ".join(current_chunk)
+                    if current_duration >= max_duration or word.endswith((".", "!", "?")):
                         chunk_end = start + current_duration
-                        chunks.append({
-                            "text": chunk_text,
-                            "start": start,
-                            "end": chunk_end
-                        })
+                        texts.append(" ".join(current_chunk))
+                        starts.append(start)
+                        ends.append(chunk_end)
                         start = chunk_end
                         current_chunk = []
                         current_duration = 0
                 
                 if current_chunk:
-                    chunks.append({
-                        "text": " ".join(current_chunk),
-                        "start": start,
-                        "end": end
-                    })
-                    
-                relevant_segments.extend(chunks)
+                    texts.append(" ".join(current_chunk))
+                    starts.append(start)
+                    ends.append(end)
             else:
-                relevant_segments.append({
-                    "text": text,
-                    "start": start,
-                    "end": end
-                })
-        
-        if not relevant_segments:
-            relevant_segments = [{
-                "start": 0,
-                "end": clip_duration,
-                "text": "[Conteúdo não verbal]"
-            }]
+                texts.append(text)
+                starts.append(start)
+                ends.append(end)
         
-        return relevant_segments
+        # Estrutura de arrays paralelos (início, fim, texto) indexados pela posição
+        return {
+            "starts": np.array(starts, dtype=np.float64),
+            "ends": np.array(ends, dtype=np.float64),
+            "texts": texts
+        }
 
     def _extract_keywords(self, text, num_keywords=3):
         """Extrai palavras-chave do texto"""
-        words = re.findall(r'\w+', text.lower())
-        stop_words = {'e', 'de', 'a', 'o', 'que', 'do', 'da', 'em', 'um', 'para', 'é', 'com', 'não', 'uma', 'os', 'no', 'se', 'na', 'por', 'mais', 'as', 'dos', 'como', 'mas', 'foi', 'ao', 'ele', 'das', 'tem', 'à', 'seu', 'sua', 'ou', 'ser', 'quando', 'muito', 'há', 'nos', 'já', 'está', 'eu', 'também', 'só', 'pelo', 'pela', 'até', 'isso', 'ela', 'entre', 'era', 'depois', 'sem', 'mesmo', 'aos', 'ter', 'seus', 'quem', 'nas', 'me', 'esse', 'eles', 'estão', 'você', 'tinha', 'foram', 'essa', 'num', 'nem', 'suas', 'meu', 'minha', 'têm', 'numa', 'pelos', 'elas', 'havia', 'seja', 'qual', 'será', 'nós', 'tenho', 'lhe', 'deles', 'essas', 'esses', 'pelas', 'este', 'fosse', 'dele', 'tu', 'te', 'vocês', 'vos', 'lhes', 'meus', 'minhas', 'teu', 'tua', 'teus', 'tuas', 'nosso', 'nossa', 'nossos', 'nossas', 'dela', 'delas', 'esta', 'estes', 'estas', 'aquele', 'aquela', 'aqueles', 'aquelas', 'isto', 'aquilo'}
-        filtered_words = [word for word in words if word not in stop_words]
-        most_common = Counter(filtered_words).most_common(num_keywords)
-        keywords = [word for word, _ in most_common]
+        words = (match.group(0) for match in _WORD_RE.finditer(text.lower()))
+        counts = {}
+        for word in words:
+            if word not in _STOP_WORDS:
+                counts[word] = counts.get(word, 0) + 1
+        keywords = [word for word, _ in nlargest(num_keywords, counts.items(), key=lambda item: item[1])]
         return ' '.join(keywords).title()
 
-    def _restore_audio_format(self, original_video_path, video_with_subtitles_path, final_output_path):
-        """Restaura o formato original do áudio no vídeo com legendas"""
-        try:
-            command = [
-                "ffmpeg",
-                "-y",
-                "-i", video_with_subtitles_path,
-                "-i", original_video_path,
-                "-c:v", "copy",
-                "-c:a", "copy",
-                "-map", "0:v:0",
-                "-map", "1:a:0",
-                final_output_path
-            ]
-            subprocess.run(command, check=True, timeout=300)
-        except subprocess.CalledProcessError as e:
-            print(f"Erro ao restaurar áudio: {e}")
-            raise
-        except subprocess.TimeoutExpired:
-            print("Tempo limite excedido para restaurar áudio")
-            raise
+    def _post(self, msg_type, content):
+        """Envia uma mensagem da thread de processamento e agenda sua exibição na thread do Tk"""
+        self.progress_queue.put((msg_type, content))
+        # Um único esvaziamento agendado atende todas as mensagens que chegarem até ele rodar
+        if not self._drain_pending:
+            self._drain_pending = True
+            try:
+                self.root.after_idle(self._drain_queue)
+            except (tk.TclError, RuntimeError):
+                # Janela já fechada durante o processamento: não há mais interface para atualizar
+                pass
 
-    def _update_progress(self):
+    def _drain_queue(self):
         """Atualiza a interface com o progresso do processamento"""
+        self._drain_pending = False
+        # As mensagens de log acumuladas são inseridas de uma vez só
+        log_lines = []
         try:
             while True:
                 msg_type, content = self.progress_queue.get_nowait()
                 
                 if msg_type == "log":
-                    self._log_message(content)
+                    log_lines.append(content)
                 elif msg_type == "progress":
                     self.progress['value'] = content
                 elif msg_type == "error":
+                    self._flush_log_lines(log_lines)
                     messagebox.showerror("Erro", content)
                     self._reset_interface()
                 elif msg_type == "complete":
+                    self._flush_log_lines(log_lines)
+                    self._save_auto_settings()
                     messagebox.showinfo("Sucesso", "Processamento concluído com sucesso!")
                     self.preview_btn.config(state=tk.NORMAL)
                     self._reset_interface()
                 
-                self.root.update_idletasks()
-                
         except queue.Empty:
             pass
-        
+        self._flush_log_lines(log_lines)
+
+    def _watch_processing(self):
+        """Verifica periodicamente se a thread de processamento terminou"""
         if self.processing_thread and self.processing_thread.is_alive():
-            self.root.after(100, self._update_progress)
+            self.root.after(500, self._watch_processing)
         else:
+            self._drain_queue()
             self._reset_interface()
 
+    def _flush_log_lines(self, log_lines):
+        """Insere as mensagens pendentes no log com um único insert/see"""
+        if log_lines:
+            self._log_message("\n".join(log_lines))
+            log_lines.clear()
+
     def _reset_interface(self):
         """Restaura a interface para o estado inicial"""
         self.progress['value'] = 0
@@ -1033,6 +1683,8 @@ class VideoProcessorApp:
             'silence_threshold': float(self.silence_threshold_slider.get()),
             'min_silence_len': float(self.min_silence_len_slider.get()),
             'safety_margin': float(self.safety_margin_slider.get()),
+            'video_codec': self.video_codec_combo.get(),
+            'fast_cut': self.fast_cut_var.get(),
             'add_subtitles': self.add_subtitles_var.get(),
             'font': self.font_combo.get(),
             'font_size': int(self.font_size.get()),
@@ -1046,11 +1698,29 @@ class VideoProcessorApp:
         }
 
     def _save_auto_settings(self):
-        """Salva as configurações automaticamente no arquivo padrão"""
+        """Agenda o salvamento automático: chamadas seguidas viram uma única gravação"""
+        if self._autosave_after_id is not None:
+            self.root.after_cancel(self._autosave_after_id)
+        self._autosave_after_id = self.root.after(500, self._do_autosave)
+
+    def _do_autosave(self):
+        """Lê as configurações na thread do Tk e grava o arquivo fora dela"""
+        self._autosave_after_id = None
         try:
             settings = self._get_current_settings()
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(settings, f, indent=4)
+        except Exception as e:
+            print(f"Erro ao salvar configurações automáticas: {e}")
+            return
+        threading.Thread(target=self._write_auto_settings, args=(settings,), daemon=True).start()
+
+    def _write_auto_settings(self, settings):
+        """Salva as configurações automaticamente no arquivo padrão"""
+        try:
+            # JSON compacto gravado num temporário e trocado de uma vez (sem arquivo pela metade)
+            fd, tmp_path = tempfile.mkstemp(suffix=".json", dir=CONFIG_DIR)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_json_dumps(settings))
+            os.replace(tmp_path, CONFIG_FILE)
         except Exception as e:
             print(f"Erro ao salvar configurações automáticas: {e}")
 
@@ -1058,8 +1728,8 @@ class VideoProcessorApp:
         """Carrega as configurações automaticamente do arquivo padrão"""
         try:
             if os.path.exists(CONFIG_FILE):
-                with open(CONFIG_FILE, 'r') as f:
-                    settings = json.load(f)
+                with open(CONFIG_FILE, 'rb') as f:
+                    settings = _json_loads(f.read())
                 
                 # Configurações básicas
                 self.model_combo.set(settings.get('whisper_model', 'medium'))
@@ -1071,6 +1741,8 @@ class VideoProcessorApp:
                 self.silence_threshold_slider.set(settings.get('silence_threshold', -40))
                 self.min_silence_len_slider.set(settings.get('min_silence_len', 1.0))
                 self.safety_margin_slider.set(settings.get('safety_margin', 0.5))
+                self.video_codec_combo.set(settings.get('video_codec', 'auto'))
+                self.fast_cut_var.set(settings.get('fast_cut', True))
                 
                 # Legendas
                 self.add_subtitles_var.set(settings.get('add_subtitles', True))
@@ -1082,7 +1754,7 @@ class VideoProcessorApp:
                 self.sub_position.set(settings.get('position', 'bottom'))
                 
                 # Animação
-                self.animation_var.set(settings.get('animation', True))
+                self.animation_var.set(settings.get('animation', False))
                 self.highlight_color.set(settings.get('highlight_color', '#FFFF00'))
                 self.animation_style.set(settings.get('animation_style', 'Digitação com Destaque'))
                 
@@ -1102,8 +1774,8 @@ class VideoProcessorApp:
         """Salva as configurações atuais no arquivo de configuração padrão"""
         try:
             settings = self._get_current_settings()
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(settings, f, indent=4)
+            with open(CONFIG_FILE, 'wb') as f:
+                f.write(_json_dumps(settings, pretty=True))
             self._log_message("Configurações salvas com sucesso!")
             messagebox.showinfo("Sucesso", "Configurações salvas automaticamente!")
         except Exception as e:
@@ -1119,8 +1791,8 @@ class VideoProcessorApp:
         
         if filepath:
             try:
-                with open(filepath, 'r') as f:
-                    settings = json.load(f)
+                with open(filepath, 'rb') as f:
+                    settings = _json_loads(f.read())
                 
                 self.model_combo.set(settings.get('whisper_model', 'medium'))
                 self.duration_entry.delete(0, tk.END)
@@ -1129,6 +1801,8 @@ class VideoProcessorApp:
                 self.silence_threshold_slider.set(settings.get('silence_threshold', -40))
                 self.min_silence_len_slider.set(settings.get('min_silence_len', 1.0))
                 self.safety_margin_slider.set(settings.get('safety_margin', 0.5))
+                self.video_codec_combo.set(settings.get('video_codec', 'auto'))
+                self.fast_cut_var.set(settings.get('fast_cut', True))
                 self.add_subtitles_var.set(settings.get('add_subtitles', True))
                 self.font_combo.set(settings.get('font', 'Arial'))
                 self.font_size.delete(0, tk.END)
@@ -1143,9 +1817,14 @@ class VideoProcessorApp:
 
     def _on_close(self):
         """Executado quando a janela está fechando"""
+        # Interrompe um processamento em andamento antes de destruir a janela
+        self.stop_event.set()
         try:
             self._save_settings()  # Usa o mesmo método de salvar
             self.temp_manager.cleanup()
+            # Libera os modelos Whisper carregados (memória da GPU inclusive)
+            self.model = None
+            self._model_cache.clear()
             self.root.destroy()
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao fechar aplicativo: {str(e)}")